@@ -2,6 +2,7 @@
 Main entry point for the Alternate Histories console application.
 """
 
+import asyncio
 import os
 import sys
 from dotenv import load_dotenv
@@ -10,15 +11,15 @@ from colorama import init, Fore, Style
 from src.game_engine import GameEngine
 from src.ui import ConsoleUI
 
-def main():
-    """Main function to run the alternate histories application."""
-    
+async def main_async():
+    """Async main loop driving the game engine and UI."""
+
     # Initialize colorama for cross-platform colored output
     init()
-    
+
     # Load environment variables
     load_dotenv()
-    
+
     # Check for OpenAI API key
     api_key = os.getenv('OPENAI_API_KEY')
     if not api_key:
@@ -28,47 +29,64 @@ def main():
         print("2. Add your OpenAI API key to the .env file")
         print("3. Run the application again")
         sys.exit(1)
-    
+
     # Initialize the game engine and UI
     try:
         game_engine = GameEngine(api_key)
         ui = ConsoleUI()
-        
+
         # Connect UI to game engine for loading indicators
         game_engine.set_ui(ui)
-        
+
+        # Warm the semantic cache in the background while the player
+        # reads the welcome screen and picks a scenario. The welcome
+        # screen blocks on input, so it runs in a worker thread like the
+        # other input-bearing screens - otherwise the warm task couldn't
+        # start until the first await.
+        warm_task = asyncio.create_task(game_engine.warm_semantic_cache())
+
         # Start the application
-        ui.welcome_screen()
-        
+        await asyncio.to_thread(ui.welcome_screen)
+
         while True:
-            scenario = ui.select_scenario()
+            # Blocking input runs in a worker thread so background
+            # pre-fetch tasks keep making progress on the event loop.
+            scenario = await asyncio.to_thread(ui.select_scenario)
             if scenario is None:  # User chose to exit
                 break
-                
+
             game_engine.start_scenario(scenario)
-            
+
             while game_engine.is_active():
                 current_state = game_engine.get_current_state()
                 ui.display_situation(current_state)
-                
-                choices = game_engine.get_available_choices()
+
+                choices = await game_engine.get_available_choices()
                 if not choices:
                     ui.display_ending(current_state)
                     break
-                
-                choice = ui.get_user_choice(choices)
+
+                choice = await asyncio.to_thread(ui.get_user_choice, choices)
                 if choice is None:  # User chose to go back
                     break
-                    
-                game_engine.make_choice(choice)
-        
+
+                await game_engine.make_choice(choice)
+
+        await game_engine.ai_client.aclose()
         ui.goodbye_screen()
-        
-    except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}Application interrupted by user.{Style.RESET_ALL}")
+
     except Exception as e:
         print(f"{Fore.RED}An error occurred: {e}{Style.RESET_ALL}")
         sys.exit(1)
 
+def main():
+    """Main function to run the alternate histories application."""
+    try:
+        asyncio.run(main_async())
+    except KeyboardInterrupt:
+        # Ctrl-C cancels the coroutine and re-raises here, outside the
+        # event loop - catching it inside main_async can't work.
+        print(f"\n{Fore.YELLOW}Application interrupted by user.{Style.RESET_ALL}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
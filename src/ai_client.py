@@ -2,47 +2,199 @@
 AI client for interacting with OpenAI API.
 """
 
-import json
-from typing import Dict, Any
-from openai import OpenAI
+from typing import Any, Callable, Dict, Optional
+
+import httpx2
+import orjson
+from openai import AsyncOpenAI
+
+from .llm_cache import LLMCache, cache_key
+from .semantic_cache import SemanticCache
+
+SYSTEM_PROMPT = "You are an expert historian and creative writer specializing in alternate history scenarios. Always respond with valid JSON."
+
+# Server-side schema validation: the API guarantees parseable output in
+# this shape, so no fallback round-trip is spent on malformed JSON.
+CONSEQUENCE_SCHEMA = {
+    "name": "consequence",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "new_situation": {"type": "string"},
+            "alterations": {"type": "array", "items": {"type": "string"}},
+            "is_ending": {"type": "boolean"},
+        },
+        "required": ["new_situation", "alterations", "is_ending"],
+        "additionalProperties": False,
+    },
+}
 
 class AIClient:
-    """Client for AI interactions."""
-    
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-4"
-    
-    def generate_choices(self, prompt: str) -> str:
-        """Generate choices using AI."""
+    """Async client for AI interactions.
+
+    Using the async SDK lets the engine issue several requests
+    concurrently (e.g. pre-fetching consequences for every visible
+    choice) instead of blocking on one network round-trip at a time.
+    Completed responses are cached by an exact hash of the request so
+    repeat playthroughs skip the network round-trip entirely.
+    """
+
+    def __init__(self, api_key: str, fast_model: str = "gpt-4o-mini",
+                 strong_model: str = "gpt-4o"):
+        # One keepalive HTTP/2 connection pool shared by every call in a
+        # session: the TLS handshake is paid once, and multiplexed
+        # streams let the prefetched requests run in parallel without
+        # head-of-line blocking.
+        self._http = httpx2.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx2.Limits(max_keepalive_connections=16, max_connections=32),
+        )
+        self.client = AsyncOpenAI(api_key=api_key, http_client=self._http)
+        # Routine narrative turns run on the fast model; the strong model
+        # is reserved for high-stakes turns routed by the game engine.
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.cache = LLMCache()
+        self.semantic_cache = SemanticCache(self.client)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache hit/miss counters for this client."""
+        return self.cache.stats
+
+    async def aclose(self):
+        """Close the SDK client and its shared connection pool."""
+        await self.client.close()
+        await self._http.aclose()
+
+    async def agenerate_choices(self, prompt: str, system: str = SYSTEM_PROMPT,
+                                model: Optional[str] = None, max_tokens: int = 250,
+                                stream: bool = True,
+                                on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Generate choices using AI.
+
+        When streaming, partial tokens are handed to `on_delta` as they
+        arrive so the UI can show progress instead of a blocking spinner.
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert historian and creative writer specializing in alternate history scenarios. Always respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
-            return response.choices[0].message.content
+            return await self._complete(prompt, system=system, model=model,
+                                        max_tokens=max_tokens, stream=stream, on_delta=on_delta,
+                                        use_semantic_cache=True)
         except Exception as e:
             raise Exception(f"AI choice generation failed: {e}")
-    
-    def generate_consequence(self, prompt: str) -> Dict[str, Any]:
+
+    async def agenerate_consequence(self, prompt: str, system: str = SYSTEM_PROMPT,
+                                    model: Optional[str] = None, max_tokens: int = 400,
+                                    stream: bool = True,
+                                    on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """Generate consequences using AI."""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert historian and creative writer specializing in alternate history scenarios. Always respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=800,
-                temperature=0.7
-            )
-            
-            content = response.choices[0].message.content
-            return json.loads(content)
+            content = await self._complete(
+                prompt, system=system, model=model, max_tokens=max_tokens,
+                stream=stream, on_delta=on_delta,
+                response_format={"type": "json_schema", "json_schema": CONSEQUENCE_SCHEMA})
+            return orjson.loads(content)
         except Exception as e:
-            raise Exception(f"AI consequence generation failed: {e}")
\ No newline at end of file
+            raise Exception(f"AI consequence generation failed: {e}")
+
+    async def _complete(self, prompt: str, system: str, model: Optional[str],
+                        max_tokens: int, stream: bool,
+                        on_delta: Optional[Callable[[str], None]],
+                        response_format: Optional[Dict[str, Any]] = None,
+                        use_semantic_cache: bool = False) -> str:
+        """Run a chat completion through the exact-match cache.
+
+        The semantic cache only applies to choice generation: consequence
+        prompts for different choices in the same situation differ by a
+        single line, so near-identical embeddings would return the
+        consequence of the wrong choice (and a cross-type hit would feed
+        a consequence payload to the choice parser).
+        """
+        model = model or self.fast_model
+        temperature = 0.7
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+
+        key = cache_key(model, messages, temperature, max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Exact miss: check whether a paraphrase of this prompt was
+        # already answered. Embedding failures must not block generation.
+        query_vector = None
+        if use_semantic_cache:
+            try:
+                cached, query_vector = await self.semantic_cache.lookup(prompt)
+                if cached is not None:
+                    return cached
+            except Exception:
+                pass
+
+        request_kwargs = dict(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=stream
+        )
+        if response_format is not None:
+            request_kwargs["response_format"] = response_format
+
+        response = await self.client.chat.completions.create(**request_kwargs)
+
+        if not stream:
+            choice = response.choices[0]
+            content = choice.message.content
+            finish_reason = choice.finish_reason
+        else:
+            content, finish_reason = await self._collect_stream(response, on_delta)
+
+        # Only complete, parseable responses enter the caches; a
+        # truncated or malformed completion must not be re-served (or
+        # persisted to disk) on every later identical call. Raising here
+        # surfaces truncation to callers, so the engine's
+        # stronger-model/larger-budget retry actually fires instead of
+        # the bad string slipping through to the parser's fallback.
+        if not self._is_complete_json(content, finish_reason):
+            raise ValueError(f"incomplete or malformed completion (finish_reason={finish_reason})")
+
+        self.cache.set(key, content)
+        if query_vector is not None:
+            self.semantic_cache.insert(query_vector, content)
+        return content
+
+    @staticmethod
+    def _is_complete_json(content: Optional[str], finish_reason: Optional[str]) -> bool:
+        """Check that a completion finished naturally and parses as JSON."""
+        if not content or finish_reason == "length":
+            return False
+        try:
+            orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return False
+        return True
+
+    async def _collect_stream(self, response,
+                              on_delta: Optional[Callable[[str], None]]) -> tuple:
+        """Accumulate a streamed completion, notifying `on_delta` per chunk.
+
+        Returns (content, finish_reason); the finish reason arrives on
+        the final chunk of the stream.
+        """
+        buffer = []
+        finish_reason = None
+        async for chunk in response:
+            choice = chunk.choices[0]
+            finish_reason = choice.finish_reason or finish_reason
+            delta = choice.delta.content or ""
+            if not delta:
+                continue
+            buffer.append(delta)
+            if on_delta:
+                on_delta(delta)
+        return "".join(buffer), finish_reason
@@ -2,184 +2,329 @@
 Game engine for managing alternate history scenarios and AI interactions.
 """
 
-import json
+import asyncio
+from collections import deque
 from typing import Dict, List, Optional, Any
-from openai import OpenAI
+
+import orjson
 
 from .scenarios import HistoricalScenario, AVAILABLE_SCENARIOS
 from .ai_client import AIClient
 
+# Static instructions live in the system message, unchanged from turn to
+# turn, so provider-side prompt caching can reuse the long fixed prefix.
+# Only the short user message below varies per call.
+CHOICE_SYSTEM_PROMPT = """You are an expert historian and creative writer creating an alternate history scenario.
+
+Generate 3-4 plausible choices that a key decision-maker in the situation described by the user might face.
+Each choice should have the potential to significantly alter the course of history.
+
+Return the response in this exact JSON format:
+{
+    "choices": [
+        {
+            "id": "choice_1",
+            "description": "Brief description of the choice",
+            "potential_impact": "Short description of potential consequences"
+        }
+    ]
+}"""
+
+# The response shape is enforced server-side via AIClient's
+# CONSEQUENCE_SCHEMA, so the prompt only explains the fields' meaning.
+CONSEQUENCE_SYSTEM_PROMPT = """You are an expert historian and creative writer narrating an alternate history scenario.
+
+Generate the immediate and long-term consequences of the choice described by the user.
+Show how this decision ripples through history.
+
+Describe the new situation after the choice in "new_situation", list specific changes to the timeline in "alterations", and set "is_ending" to true only if this choice leads to a natural conclusion of the scenario."""
+
+# Turns at or beyond this depth are treated as potential endings and
+# routed to the strong model for higher-quality consequences.
+ENDING_TURN_THRESHOLD = 5
+
+# Bounds on the timeline-alteration log: at most MAX_ALTERATIONS are
+# retained (old entries age out), and only the last PROMPT_ALTERATIONS
+# are sent back to the model as context.
+MAX_ALTERATIONS = 50
+PROMPT_ALTERATIONS = 10
+
+def _retrieve_task_exception(task: asyncio.Task):
+    """Mark a finished task's exception as retrieved.
+
+    Speculative prefetches that fail before being awaited (or cancelled)
+    would otherwise make asyncio dump 'Task exception was never
+    retrieved' tracebacks into the console UI.
+    """
+    if not task.cancelled():
+        task.exception()
+
+# User-message templates, interned once at import instead of rebuilt as
+# f-string literals on every call.
+_CHOICE_USER_TEMPLATE = (
+    "Scenario: {scenario}\n"
+    "Situation: {situation}\n"
+    "Recent choices: {recent}\n"
+    "Recent timeline changes: {alterations}"
+)
+
+_CONSEQUENCE_USER_TEMPLATE = (
+    "Scenario: {scenario}\n"
+    "Situation: {situation}\n"
+    "Recent timeline changes: {alterations}\n"
+    "Choice made: {choice}"
+)
+
 class GameState:
     """Represents the current state of the game."""
-    
+
     def __init__(self, scenario: HistoricalScenario):
         self.scenario = scenario
         self.current_situation = scenario.initial_situation
         self.choices_made = []
-        self.timeline_alterations = []
+        self.timeline_alterations = deque(maxlen=MAX_ALTERATIONS)
         self.is_complete = False
 
 class GameEngine:
     """Main game engine that orchestrates the alternate history experience."""
-    
+
     def __init__(self, api_key: str):
         self.ai_client = AIClient(api_key)
         self.current_state: Optional[GameState] = None
         self._active = False
         self.ui = None  # Will be set by main.py
-    
+        self._prefetched: Dict[str, asyncio.Task] = {}
+        self._choice_map: Optional[Dict[str, Dict[str, str]]] = None
+        self._choice_system = CHOICE_SYSTEM_PROMPT
+        self._consequence_system = CONSEQUENCE_SYSTEM_PROMPT
+
     def set_ui(self, ui):
         """Set the UI reference for loading indicators."""
         self.ui = ui
-    
+
     def start_scenario(self, scenario_name: str) -> bool:
         """Start a new scenario."""
         scenario = AVAILABLE_SCENARIOS.get(scenario_name)
         if not scenario:
             return False
-        
+
+        self._cancel_prefetched()
+        self._choice_map = None
         self.current_state = GameState(scenario)
         self._active = True
+
+        # Preload the full scenario context into the system prompts once
+        # per playthrough, so the fast model has the grounding it needs
+        # without re-sending it in every user message.
+        grounding = (
+            f"Scenario background:\n"
+            f"Name: {scenario.name}\n"
+            f"Time period: {scenario.time_period}\n"
+            f"Premise: {scenario.description}\n"
+            f"Opening situation: {scenario.initial_situation}"
+        )
+        self._choice_system = f"{CHOICE_SYSTEM_PROMPT}\n\n{grounding}"
+        self._consequence_system = f"{CONSEQUENCE_SYSTEM_PROMPT}\n\n{grounding}"
         return True
-    
+
     def is_active(self) -> bool:
         """Check if a game is currently active."""
         return self._active and self.current_state is not None and not self.current_state.is_complete
-    
+
     def get_current_state(self) -> Dict[str, Any]:
         """Get the current game state for display."""
         if not self.current_state:
             return {}
-        
+
         return {
             'scenario_name': self.current_state.scenario.name,
             'situation': self.current_state.current_situation,
             'choices_made': len(self.current_state.choices_made),
             'timeline_alterations': self.current_state.timeline_alterations
         }
-    
-    def get_available_choices(self) -> List[Dict[str, str]]:
+
+    async def get_available_choices(self) -> List[Dict[str, str]]:
         """Get available choices for the current situation."""
         if not self.current_state or self.current_state.is_complete:
             return []
-        
+
         # Use AI to generate contextual choices
         prompt = self._build_choice_generation_prompt()
-        
+
         try:
             if self.ui:
                 self.ui.start_loading("Generating historical choices")
-            
-            response = self.ai_client.generate_choices(prompt)
-            
+
+            # Fallback chain: fast model, then strong model, then the
+            # predefined choices if the API is unreachable entirely.
+            try:
+                response = await self.ai_client.agenerate_choices(
+                    prompt, system=self._choice_system)
+            except Exception:
+                # Retry with more headroom in case truncation broke the JSON.
+                response = await self.ai_client.agenerate_choices(
+                    prompt, system=self._choice_system, model=self.ai_client.strong_model,
+                    max_tokens=500)
+
             if self.ui:
                 self.ui.stop_loading()
-            
-            return self._parse_ai_choices(response)
+
+            choices = self._parse_ai_choices(response)
         except Exception as e:
             if self.ui:
                 self.ui.stop_loading()
             # Fallback to predefined choices if AI fails
-            return self._get_fallback_choices()
-    
-    def make_choice(self, choice_id: str) -> bool:
+            choices = self._get_fallback_choices()
+
+        # Remember what was shown so make_choice can resolve the picked id
+        # without a second (wholly redundant) generation call.
+        self._choice_map = {choice['id']: choice for choice in choices}
+
+        # Speculatively pre-fetch consequences for every visible choice so
+        # that by the time the player decides, the answer is usually in flight
+        # or already complete.
+        self._cancel_prefetched()
+        # The prefetched consequence belongs to the *next* turn: the
+        # choice it answers hasn't been appended to choices_made yet.
+        turn = len(self.current_state.choices_made) + 1
+        for choice in choices:
+            task = asyncio.create_task(
+                self.ai_client.agenerate_consequence(
+                    self._build_consequence_prompt(choice), system=self._consequence_system,
+                    model=self._consequence_model(turn),
+                    max_tokens=self._consequence_max_tokens(turn))
+            )
+            task.add_done_callback(_retrieve_task_exception)
+            self._prefetched[choice['id']] = task
+
+        return choices
+
+    async def make_choice(self, choice_id: str) -> bool:
         """Make a choice and advance the story."""
         if not self.current_state:
             return False
-        
-        # Find the choice details
-        available_choices = self.get_available_choices()
-        chosen_option = next((choice for choice in available_choices if choice['id'] == choice_id), None)
-        
+
+        # Resolve the picked id against the options already shown,
+        # regenerating only if nothing was cached for this turn.
+        if self._choice_map is None:
+            await self.get_available_choices()
+        chosen_option = (self._choice_map or {}).get(choice_id)
+
         if not chosen_option:
             return False
-        
+
         # Record the choice
         self.current_state.choices_made.append(chosen_option)
-        
-        # Generate consequences using AI
-        consequence_prompt = self._build_consequence_prompt(chosen_option)
-        
+
         try:
             if self.ui:
                 self.ui.start_loading("Calculating historical consequences")
-            
-            consequence = self.ai_client.generate_consequence(consequence_prompt)
-            
+
+            # Await the pre-fetched consequence if one is in flight,
+            # otherwise fall back to a fresh call.
+            prefetched = self._prefetched.pop(choice_id, None)
+            if prefetched is not None:
+                consequence = await prefetched
+            else:
+                consequence_prompt = self._build_consequence_prompt(chosen_option)
+                turn = len(self.current_state.choices_made)
+                consequence = await self.ai_client.agenerate_consequence(
+                    consequence_prompt, system=self._consequence_system,
+                    model=self._consequence_model(turn),
+                    max_tokens=self._consequence_max_tokens(turn))
+
             if self.ui:
                 self.ui.stop_loading()
-            
+
             self.current_state.current_situation = consequence['new_situation']
             self.current_state.timeline_alterations.extend(consequence.get('alterations', []))
-            
+
             # Check if this ends the scenario
             if consequence.get('is_ending', False):
                 self.current_state.is_complete = True
-            
+
         except Exception as e:
             if self.ui:
                 self.ui.stop_loading()
             # Fallback consequence
             self.current_state.current_situation = f"Your choice to '{chosen_option['description']}' has created ripple effects through history..."
-        
+        finally:
+            # Speculative fetches for the paths not taken are no longer
+            # needed, and the shown choices no longer match the new state.
+            self._cancel_prefetched()
+            self._choice_map = None
+
         return True
-    
-    def _build_choice_generation_prompt(self) -> str:
-        """Build a prompt for AI to generate contextual choices."""
-        state = self.current_state
-        return f"""
-        You are creating an alternate history scenario. 
-        
-        Historical Context: {state.scenario.name}
-        Current Situation: {state.current_situation}
-        Previous Choices: {[choice['description'] for choice in state.choices_made[-3:]]}
-        
-        Generate 3-4 plausible choices that a key decision-maker in this situation might face.
-        Each choice should have the potential to significantly alter the course of history.
-        
-        Return the response in this exact JSON format:
-        {{
-            "choices": [
-                {{
-                    "id": "choice_1",
-                    "description": "Brief description of the choice",
-                    "potential_impact": "Short description of potential consequences"
-                }}
-            ]
-        }}
+
+    def _consequence_model(self, turn: int) -> Optional[str]:
+        """Route late-game consequence turns to the strong model.
+
+        `turn` counts the choice being resolved, so prefetch (before the
+        append to choices_made) and the direct fallback (after it) agree.
+        """
+        if turn >= ENDING_TURN_THRESHOLD:
+            return self.ai_client.strong_model
+        return None  # AIClient defaults to its fast model
+
+    def _consequence_max_tokens(self, turn: int) -> int:
+        """Give ending-depth turns a larger generation budget."""
+        if turn >= ENDING_TURN_THRESHOLD:
+            return 600
+        return 400
+
+    def _cancel_prefetched(self):
+        """Cancel any outstanding speculative consequence fetches."""
+        for task in self._prefetched.values():
+            task.cancel()
+        self._prefetched = {}
+
+    async def warm_semantic_cache(self):
+        """Pre-embed the opening prompt of every scenario in one batched call.
+
+        Run as a background task at startup so the first move of any
+        scenario finds its prompt embedding already computed.
         """
-    
+        prompts = [
+            self._build_choice_generation_prompt(GameState(scenario))
+            for scenario in AVAILABLE_SCENARIOS.values()
+        ]
+        try:
+            await self.ai_client.semantic_cache.warm(prompts)
+        except Exception:
+            pass  # Warming is best-effort; lookups embed on demand anyway.
+
+    def _build_choice_generation_prompt(self, state: Optional[GameState] = None) -> str:
+        """Build the dynamic user message for choice generation.
+
+        Previous choices are kept in the order they were made, so
+        identical game states always produce byte-identical prompts.
+        """
+        state = state or self.current_state
+        return _CHOICE_USER_TEMPLATE.format_map({
+            "scenario": state.scenario.name,
+            "situation": state.current_situation,
+            "recent": [choice['description'] for choice in state.choices_made[-3:]],
+            "alterations": list(state.timeline_alterations)[-PROMPT_ALTERATIONS:],
+        })
+
     def _build_consequence_prompt(self, choice: Dict[str, str]) -> str:
-        """Build a prompt for AI to generate consequences of a choice."""
+        """Build the dynamic user message for consequence generation."""
         state = self.current_state
-        return f"""
-        You are narrating an alternate history scenario.
-        
-        Historical Context: {state.scenario.name}
-        Current Situation: {state.current_situation}
-        Choice Made: {choice['description']}
-        
-        Generate the immediate and long-term consequences of this choice.
-        Show how this decision ripples through history.
-        
-        Return the response in this exact JSON format:
-        {{
-            "new_situation": "Description of the new situation after the choice",
-            "alterations": ["List of specific changes to the timeline"],
-            "is_ending": false
-        }}
-        
-        Set "is_ending" to true if this choice leads to a natural conclusion of the scenario.
-        """
-    
+        return _CONSEQUENCE_USER_TEMPLATE.format_map({
+            "scenario": state.scenario.name,
+            "situation": state.current_situation,
+            "alterations": list(state.timeline_alterations)[-PROMPT_ALTERATIONS:],
+            "choice": choice['description'],
+        })
+
     def _parse_ai_choices(self, ai_response: str) -> List[Dict[str, str]]:
         """Parse AI response into choice format."""
         try:
-            data = json.loads(ai_response)
+            data = orjson.loads(ai_response)
             return data.get('choices', [])
         except:
             return self._get_fallback_choices()
-    
+
     def _get_fallback_choices(self) -> List[Dict[str, str]]:
         """Provide fallback choices if AI fails."""
         return [
@@ -198,4 +343,4 @@ class GameEngine:
                 "description": "Wait and gather more information",
                 "potential_impact": "Safer approach but may miss opportunities"
             }
-        ]
\ No newline at end of file
+        ]
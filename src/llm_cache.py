@@ -0,0 +1,85 @@
+"""
+Exact-match response cache for LLM calls.
+"""
+
+import hashlib
+import os
+import shelve
+import time
+from typing import Any, Optional
+
+import orjson
+
+# On-disk persistence location so repeat playthroughs across sessions
+# also hit the cache.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "alternate_histories")
+
+def cache_key(model: str, messages: list, temperature: float, max_tokens: int) -> str:
+    """Build a deterministic sha256 key for a chat completion request."""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+class LLMCache:
+    """Key/value cache for completed LLM responses.
+
+    Lookups hit an in-memory dict first, then fall through to an optional
+    shelve file under ~/.cache/alternate_histories/. Entries carry an
+    expiry timestamp; expired entries are dropped on read.
+    """
+
+    def __init__(self, persist: bool = True, default_ttl: float = 7 * 24 * 3600):
+        self._memory = {}
+        self._shelf = None
+        self.default_ttl = default_ttl
+        self.stats = {"hits": 0, "misses": 0}
+
+        if persist:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                self._shelf = shelve.open(os.path.join(CACHE_DIR, "responses"))
+            except Exception:
+                # Persistence is best-effort; fall back to memory-only.
+                self._shelf = None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None on miss/expiry."""
+        entry = self._memory.get(key)
+        if entry is None and self._shelf is not None:
+            entry = self._shelf.get(key)
+            if entry is not None:
+                self._memory[key] = entry
+
+        if entry is not None:
+            value, expires_at = entry
+            if time.time() < expires_at:
+                self.stats["hits"] += 1
+                return value
+            self._evict(key)
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store `value` under `key` for `ttl` seconds (default one week)."""
+        entry = (value, time.time() + (ttl or self.default_ttl))
+        self._memory[key] = entry
+        if self._shelf is not None:
+            try:
+                self._shelf[key] = entry
+                self._shelf.sync()
+            except Exception:
+                pass
+
+    def _evict(self, key: str):
+        """Remove an expired entry from both tiers."""
+        self._memory.pop(key, None)
+        if self._shelf is not None:
+            try:
+                del self._shelf[key]
+            except Exception:
+                pass
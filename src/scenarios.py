@@ -2,10 +2,12 @@
 Historical scenarios for the alternate history application.
 """
 
+import functools
 from dataclasses import dataclass
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HistoricalScenario:
     """Represents a historical scenario with alternate possibilities."""
     
@@ -14,8 +16,8 @@ class HistoricalScenario:
     time_period: str
     initial_situation: str
 
-# Available scenarios
-AVAILABLE_SCENARIOS: Dict[str, HistoricalScenario] = {
+# Available scenarios (read-only: frozen instances in an immutable mapping)
+AVAILABLE_SCENARIOS: Mapping[str, HistoricalScenario] = MappingProxyType({
     "library_alexandria": HistoricalScenario(
         name="The Library of Alexandria",
         description="What if the great Library of Alexandria was never destroyed?",
@@ -158,8 +160,13 @@ AVAILABLE_SCENARIOS: Dict[str, HistoricalScenario] = {
             "with the invasion despite the weather or postpone and risk the consequences."
         )
     )
-}
+})
 
-def get_scenario_list() -> Dict[str, str]:
-    """Get a simple list of scenario names and descriptions."""
-    return {key: scenario.description for key, scenario in AVAILABLE_SCENARIOS.items()}
\ No newline at end of file
+# Precomputed orderings so the UI doesn't rebuild them on every redraw.
+SCENARIO_KEYS: Tuple[str, ...] = tuple(AVAILABLE_SCENARIOS.keys())
+SCENARIO_ITEMS: Tuple[Tuple[str, HistoricalScenario], ...] = tuple(AVAILABLE_SCENARIOS.items())
+
+@functools.lru_cache(maxsize=1)
+def get_scenario_list() -> Tuple[Tuple[str, str], ...]:
+    """Get an immutable list of scenario keys and descriptions."""
+    return tuple((key, scenario.description) for key, scenario in SCENARIO_ITEMS)
\ No newline at end of file
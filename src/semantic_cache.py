@@ -0,0 +1,96 @@
+"""
+Semantic cache over prompt embeddings.
+
+Collapses paraphrased prompts onto previously generated completions:
+prompts are embedded, cosine-searched against everything seen so far,
+and a stored completion is reused when similarity clears a threshold.
+A hit trades a full GPT round-trip for one cheap embedding call.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+SIMILARITY_THRESHOLD = 0.92
+
+# The embeddings endpoint accepts up to 2048 inputs per request.
+MAX_EMBED_BATCH = 2048
+
+class SemanticCache:
+    """In-memory cosine-similarity cache of (prompt embedding, completion) pairs.
+
+    Embeddings are L2-normalized on insert and kept in a single float32
+    matrix, so lookup is one matrix-vector product. For much larger
+    corpora the matmul could be swapped for an ANN index (e.g. hnswlib)
+    without changing the interface.
+    """
+
+    def __init__(self, client, threshold: float = SIMILARITY_THRESHOLD):
+        self.client = client  # AsyncOpenAI, shared with AIClient
+        self.threshold = threshold
+        self._embeddings = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._responses = []
+        self._vector_memo = {}  # text -> pre-computed embedding, filled by warm()
+        self.stats = {"hits": 0, "misses": 0}
+
+    async def lookup(self, prompt: str) -> Tuple[Optional[Any], np.ndarray]:
+        """Search for a semantically similar prompt.
+
+        Returns (stored response or None, query embedding). The embedding
+        is returned so a subsequent insert() doesn't have to re-embed.
+        """
+        query = await self._embed(prompt)
+
+        if len(self._responses) > 0:
+            sims = self._embeddings @ query
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                self.stats["hits"] += 1
+                return self._responses[best], query
+
+        self.stats["misses"] += 1
+        return None, query
+
+    def insert(self, query: np.ndarray, response: Any):
+        """Store a completion under its (already computed) prompt embedding."""
+        self._embeddings = np.vstack([self._embeddings, query[None, :]])
+        self._responses.append(response)
+
+    async def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts in as few API round-trips as possible.
+
+        Amortizes TLS/HTTP overhead over up to MAX_EMBED_BATCH inputs per
+        request instead of one round-trip per text. Rows come back
+        L2-normalized, matching single-text _embed output.
+        """
+        rows = []
+        for start in range(0, len(texts), MAX_EMBED_BATCH):
+            chunk = texts[start:start + MAX_EMBED_BATCH]
+            response = await self.client.embeddings.create(model=EMBEDDING_MODEL, input=chunk)
+            rows.append(np.asarray([item.embedding for item in response.data], dtype=np.float32))
+
+        matrix = np.vstack(rows) if rows else np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    async def warm(self, texts: List[str]):
+        """Pre-embed `texts` with one batched call so later lookups skip the RTT."""
+        matrix = await self.embed_many(texts)
+        for text, vector in zip(texts, matrix):
+            self._vector_memo[text] = vector
+
+    async def _embed(self, text: str) -> np.ndarray:
+        """Embed `text` and L2-normalize for cosine-by-dot-product."""
+        memoized = self._vector_memo.get(text)
+        if memoized is not None:
+            return memoized
+
+        response = await self.client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
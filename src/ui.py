@@ -2,108 +2,138 @@
 Console user interface for the alternate history application.
 """
 
+import asyncio
 import os
-import time
-import threading
+import sys
+import textwrap
 from typing import Dict, List, Optional
 from colorama import Fore, Back, Style
 
-from .scenarios import get_scenario_list
+from .scenarios import get_scenario_list, SCENARIO_KEYS
+
+# Color codes resolved once at import; colorama's Fore/Style proxies
+# cost an attribute lookup on every access otherwise.
+_CYAN, _YELLOW, _GREEN, _BLUE, _MAGENTA, _RED, _RESET = (
+    Fore.CYAN, Fore.YELLOW, Fore.GREEN, Fore.BLUE, Fore.MAGENTA, Fore.RED, Style.RESET_ALL
+)
+
+# Shared wrapper instance; width/indent are adjusted per call.
+_WRAPPER = textwrap.TextWrapper(width=80, break_long_words=False)
 
 class ConsoleUI:
     """Console-based user interface."""
-    
+
+    # Color codes encoded once; the spinner writes raw bytes to the fd
+    # rather than going through the buffered TextIO layer every frame.
+    _YELLOW_BYTES = _YELLOW.encode()
+    _RESET_BYTES = _RESET.encode()
+
     def __init__(self):
         self.width = 80
-        self._loading = False
-        self._loading_thread = None
+        self._spinner_task = None
     
     def clear_screen(self):
-        """Clear the console screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        """Clear the console screen.
+
+        Writes the ANSI clear + home sequence directly instead of
+        spawning a `clear`/`cls` subprocess; colorama.init() translates
+        it on Windows terminals.
+        """
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
     
     def start_loading(self, message: str = "Consulting the AI oracle"):
-        """Start displaying a loading indicator."""
-        self._loading = True
-        self._loading_thread = threading.Thread(target=self._show_loading_animation, args=(message,))
-        self._loading_thread.daemon = True
-        self._loading_thread.start()
-    
+        """Start displaying a loading indicator on the event loop."""
+        if self._spinner_task is not None:
+            return
+        self._spinner_task = asyncio.create_task(self._show_loading_animation(message))
+
     def stop_loading(self):
-        """Stop the loading indicator."""
-        self._loading = False
-        if self._loading_thread:
-            self._loading_thread.join(timeout=0.5)
+        """Stop the loading indicator.
+
+        Cancellation is enough: the loop is single-threaded, so a
+        cancelled spinner task never gets to print another frame.
+        """
+        if self._spinner_task is None:
+            return
+        self._spinner_task.cancel()
+        self._spinner_task = None
         # Clear the loading line
         print(f"\r{' ' * (self.width)}\r", end='', flush=True)
+
+    def append_stream(self, text: str):
+        """Print a streamed fragment of AI output without a newline."""
+        print(text, end='', flush=True)
     
-    def _show_loading_animation(self, message: str):
-        """Show animated loading indicator."""
+    async def _show_loading_animation(self, message: str):
+        """Show animated loading indicator, yielding between frames."""
         spinner_chars = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
         dots = ""
         spinner_idx = 0
-        
-        while self._loading:
+        pad = self.width - 1
+        fd = sys.stdout.fileno()
+
+        while True:
             # Cycle through spinner characters
             spinner = spinner_chars[spinner_idx % len(spinner_chars)]
             spinner_idx += 1
-            
+
             # Cycle dots
             dots = "." * ((len(dots) % 3) + 1)
-            
-            # Display loading message
-            loading_text = f"{Fore.YELLOW}{spinner} {message}{dots}{Style.RESET_ALL}"
-            print(f"\r{loading_text:<{self.width-1}}", end='', flush=True)
-            
-            time.sleep(0.1)
+
+            # One unbuffered write per frame
+            line = b"\r" + self._YELLOW_BYTES + f"{spinner} {message}{dots}".ljust(pad).encode() + self._RESET_BYTES
+            os.write(fd, line)
+
+            await asyncio.sleep(0.1)
     
     def print_header(self, title: str):
         """Print a formatted header."""
-        print(f"\n{Fore.CYAN}{'=' * self.width}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{title.center(self.width)}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'=' * self.width}{Style.RESET_ALL}\n")
+        print(f"\n{_CYAN}{'=' * self.width}{_RESET}")
+        print(f"{_CYAN}{title.center(self.width)}{_RESET}")
+        print(f"{_CYAN}{'=' * self.width}{_RESET}\n")
     
     def print_separator(self):
         """Print a section separator."""
-        print(f"{Fore.BLUE}{'-' * self.width}{Style.RESET_ALL}")
+        print(f"{_BLUE}{'-' * self.width}{_RESET}")
     
     def welcome_screen(self):
         """Display the welcome screen."""
         self.clear_screen()
         self.print_header("ALTERNATE HISTORIES EXPLORER")
         
-        print(f"{Fore.YELLOW}Welcome to the Alternate Histories Explorer!{Style.RESET_ALL}")
+        print(f"{_YELLOW}Welcome to the Alternate Histories Explorer!{_RESET}")
         print()
         print("Explore pivotal moments in history and discover how different choices")
         print("could have changed the course of human civilization.")
         print()
-        print(f"{Fore.GREEN}• Choose from historical scenarios{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}• Make decisions at crucial turning points{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}• See how your choices reshape history{Style.RESET_ALL}")
+        print(f"{_GREEN}• Choose from historical scenarios{_RESET}")
+        print(f"{_GREEN}• Make decisions at crucial turning points{_RESET}")
+        print(f"{_GREEN}• See how your choices reshape history{_RESET}")
         print()
-        input(f"{Fore.MAGENTA}Press Enter to continue...{Style.RESET_ALL}")
+        input(f"{_MAGENTA}Press Enter to continue...{_RESET}")
     
     def select_scenario(self) -> Optional[str]:
         """Let user select a scenario."""
+        scenarios = get_scenario_list()
+        scenario_keys = SCENARIO_KEYS
+
         while True:
             self.clear_screen()
             self.print_header("SELECT A HISTORICAL SCENARIO")
-            
-            scenarios = get_scenario_list()
-            
-            print(f"{Fore.YELLOW}Available scenarios:{Style.RESET_ALL}\n")
-            
-            scenario_keys = list(scenarios.keys())
-            for i, (key, description) in enumerate(scenarios.items(), 1):
-                print(f"{Fore.GREEN}{i}.{Style.RESET_ALL} {description}")
+
+            print(f"{_YELLOW}Available scenarios:{_RESET}\n")
+
+            for i, (key, description) in enumerate(scenarios, 1):
+                print(f"{_GREEN}{i}.{_RESET} {description}")
                 print()
             
-            print(f"{Fore.RED}{len(scenarios) + 1}.{Style.RESET_ALL} Exit application")
+            print(f"{_RED}{len(scenarios) + 1}.{_RESET} Exit application")
             
             self.print_separator()
             
             try:
-                choice = input(f"\n{Fore.CYAN}Enter your choice (1-{len(scenarios) + 1}): {Style.RESET_ALL}").strip()
+                choice = input(f"\n{_CYAN}Enter your choice (1-{len(scenarios) + 1}): {_RESET}").strip()
                 
                 if not choice.isdigit():
                     continue
@@ -115,7 +145,7 @@ class ConsoleUI:
                 elif 1 <= choice_num <= len(scenarios):
                     return scenario_keys[choice_num - 1]
                 else:
-                    print(f"{Fore.RED}Invalid choice. Please try again.{Style.RESET_ALL}")
+                    print(f"{_RED}Invalid choice. Please try again.{_RESET}")
                     input("Press Enter to continue...")
                     
             except (ValueError, KeyboardInterrupt):
@@ -126,7 +156,7 @@ class ConsoleUI:
         self.clear_screen()
         self.print_header(f"SCENARIO: {state.get('scenario_name', 'Unknown').upper()}")
         
-        print(f"{Fore.YELLOW}Current Situation:{Style.RESET_ALL}")
+        print(f"{_YELLOW}Current Situation:{_RESET}")
         print()
         
         # Wrap text for better readability
@@ -136,14 +166,14 @@ class ConsoleUI:
         print()
         
         if state.get('timeline_alterations'):
-            print(f"{Fore.MAGENTA}Timeline Alterations:{Style.RESET_ALL}")
+            print(f"{_MAGENTA}Timeline Alterations:{_RESET}")
             for i, alteration in enumerate(state['timeline_alterations'], 1):
-                print(f"{Fore.BLUE}  {i}. {alteration}{Style.RESET_ALL}")
+                print(f"{_BLUE}  {i}. {alteration}{_RESET}")
             print()
         
         choices_made = state.get('choices_made', 0)
         if choices_made > 0:
-            print(f"{Fore.GREEN}Decisions made so far: {choices_made}{Style.RESET_ALL}")
+            print(f"{_GREEN}Decisions made so far: {choices_made}{_RESET}")
             print()
     
     def get_user_choice(self, choices: List[Dict[str, str]]) -> Optional[str]:
@@ -152,19 +182,19 @@ class ConsoleUI:
             return None
         
         self.print_separator()
-        print(f"{Fore.YELLOW}What do you choose?{Style.RESET_ALL}\n")
+        print(f"{_YELLOW}What do you choose?{_RESET}\n")
         
         for i, choice in enumerate(choices, 1):
-            print(f"{Fore.GREEN}{i}.{Style.RESET_ALL} {choice['description']}")
+            print(f"{_GREEN}{i}.{_RESET} {choice['description']}")
             if choice.get('potential_impact'):
-                print(f"   {Fore.BLUE}→ {choice['potential_impact']}{Style.RESET_ALL}")
+                print(f"   {_BLUE}→ {choice['potential_impact']}{_RESET}")
             print()
         
-        print(f"{Fore.RED}{len(choices) + 1}.{Style.RESET_ALL} Return to scenario selection")
+        print(f"{_RED}{len(choices) + 1}.{_RESET} Return to scenario selection")
         
         while True:
             try:
-                choice_input = input(f"\n{Fore.CYAN}Enter your choice (1-{len(choices) + 1}): {Style.RESET_ALL}").strip()
+                choice_input = input(f"\n{_CYAN}Enter your choice (1-{len(choices) + 1}): {_RESET}").strip()
                 
                 if not choice_input.isdigit():
                     continue
@@ -176,7 +206,7 @@ class ConsoleUI:
                 elif 1 <= choice_num <= len(choices):
                     return choices[choice_num - 1]['id']
                 else:
-                    print(f"{Fore.RED}Invalid choice. Please try again.{Style.RESET_ALL}")
+                    print(f"{_RED}Invalid choice. Please try again.{_RESET}")
                     
             except (ValueError, KeyboardInterrupt):
                 continue
@@ -184,46 +214,40 @@ class ConsoleUI:
     def display_ending(self, state: Dict):
         """Display the ending of a scenario."""
         self.print_separator()
-        print(f"\n{Fore.YELLOW}SCENARIO COMPLETE{Style.RESET_ALL}\n")
+        print(f"\n{_YELLOW}SCENARIO COMPLETE{_RESET}\n")
         
         print("Your choices have led to this conclusion:")
         print()
         self._print_wrapped_text(state.get('situation', ''))
         
         if state.get('timeline_alterations'):
-            print(f"\n{Fore.MAGENTA}Final Timeline Changes:{Style.RESET_ALL}")
+            print(f"\n{_MAGENTA}Final Timeline Changes:{_RESET}")
             for i, alteration in enumerate(state['timeline_alterations'], 1):
-                print(f"{Fore.BLUE}  {i}. {alteration}{Style.RESET_ALL}")
+                print(f"{_BLUE}  {i}. {alteration}{_RESET}")
         
         print()
-        input(f"{Fore.MAGENTA}Press Enter to return to scenario selection...{Style.RESET_ALL}")
+        input(f"{_MAGENTA}Press Enter to return to scenario selection...{_RESET}")
     
     def goodbye_screen(self):
         """Display goodbye message."""
         self.clear_screen()
         self.print_header("THANK YOU FOR EXPLORING")
         
-        print(f"{Fore.YELLOW}Thank you for exploring alternate histories!{Style.RESET_ALL}")
+        print(f"{_YELLOW}Thank you for exploring alternate histories!{_RESET}")
         print()
         print("Remember: Every choice we make shapes the future.")
         print("History is not just what happened, but what could have been.")
         print()
-        print(f"{Fore.GREEN}Goodbye, time traveler!{Style.RESET_ALL}")
+        print(f"{_GREEN}Goodbye, time traveler!{_RESET}")
         print()
     
     def _print_wrapped_text(self, text: str, indent: int = 0):
         """Print text wrapped to console width."""
-        words = text.split()
-        current_line = " " * indent
-        
-        for word in words:
-            if len(current_line) + len(word) + 1 <= self.width - indent:
-                if current_line.strip():
-                    current_line += " "
-                current_line += word
-            else:
-                print(current_line)
-                current_line = " " * indent + word
-        
-        if current_line.strip():
-            print(current_line)
\ No newline at end of file
+        _WRAPPER.width = self.width - indent
+        _WRAPPER.initial_indent = _WRAPPER.subsequent_indent = " " * indent
+
+        lines = _WRAPPER.wrap(text)
+        if lines:
+            # One write per paragraph instead of one per line/word.
+            sys.stdout.write("\n".join(lines))
+            sys.stdout.write("\n")
\ No newline at end of file